@@ -4,20 +4,80 @@ Replaces the old SQLite db.py with Supabase connections
 """
 
 import os
-from supabase import create_client, Client
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime, timezone
+from contextlib import contextmanager
+import httpx
+from supabase import create_client, Client, ClientOptions
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import Json, RealDictCursor, execute_values
+from typing import Optional, List, Dict, Sequence, Any
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 # Supabase connection
 _supabase_client: Optional[Client] = None
+_http_client: Optional[httpx.Client] = None
+
+# Keep-alive HTTP pool shared by all PostgREST calls
+_HTTP_MAX_CONNECTIONS = 40
+_HTTP_MAX_KEEPALIVE = 20
+_HTTP_TIMEOUT = 30
+
+# Direct Postgres pool for hot read paths (only used when SUPABASE_DB_URL is set)
+_pg_pool: Optional[ThreadedConnectionPool] = None
+_pg_pool_lock = threading.Lock()
+_pg_pool_failed = False
+_PG_POOL_MIN = 5
+_PG_POOL_MAX = 20
+_PG_STATEMENT_TIMEOUT_MS = 30000
+
+# Rows per INSERT statement/request for bulk writes
+_DEFAULT_BULK_BATCH_SIZE = 50
+
+
+def _bulk_batch_size() -> int:
+    """DB_BULK_BATCH_SIZE from the environment, or the default if unset or invalid"""
+    value = os.environ.get("DB_BULK_BATCH_SIZE")
+    if value is None:
+        return _DEFAULT_BULK_BATCH_SIZE
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        logger.warning(f"Invalid DB_BULK_BATCH_SIZE {value!r}, using {_DEFAULT_BULK_BATCH_SIZE}")
+        return _DEFAULT_BULK_BATCH_SIZE
+    return size
+
+
+_BULK_BATCH_SIZE = _bulk_batch_size()
+
+# Columns returned by list getters; detail getters (get_*_by_id) still select '*'
+_ITEM_LIST_COLS = ('id, sku, item_name, category, size, brand, platforms, listing_status, '
+                   'purchase_price, sale_price, profit, roi_percent, date_listed, date_sold, created_at')
+_SALE_LIST_COLS = ('id, order_id, platform, item_id, item_name, sale_price, fees, net_profit, '
+                   'date_sold, date_shipped, tracking_number, payout_status, buyer_name, created_at')
+_SHIPMENT_LIST_COLS = ('id, sale_id, item_name, platform, buyer_name, status, tracking_number, '
+                       'carrier, shipped_at, delivered_at, created_at')
+_RETURN_CASE_LIST_COLS = ('id, sale_id, item_name, platform, reason, status, outcome, refund_amount, '
+                          'opened_at, resolved_at, created_at')
+_TASK_LIST_COLS = ('id, title, description, priority, status, due_date, related_item_id, '
+                   'related_sale_id, created_at')
+_VINTED_LOG_LIST_COLS = 'id, event_type, status, message, created_at'
+
+# In-process settings cache: key -> (fetched_at, value)
+_SETTINGS_TTL = 30
+_settings_cache: Dict[str, tuple] = {}
 
 
 def get_supabase() -> Client:
     """Get or create Supabase client"""
-    global _supabase_client
+    global _supabase_client, _http_client
 
     if _supabase_client is None:
         url = os.environ.get("SUPABASE_URL")
@@ -26,22 +86,296 @@ def get_supabase() -> Client:
         if not url or not key:
             raise Exception("SUPABASE_URL and SUPABASE_ANON_KEY environment variables required")
 
-        _supabase_client = create_client(url, key)
-        logger.info("Supabase client initialized")
+        # Hand supabase-py a pooled HTTP/2 client so every table/rpc call
+        # reuses open connections instead of redoing TLS
+        _http_client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=_HTTP_MAX_KEEPALIVE
+            ),
+            timeout=_HTTP_TIMEOUT
+        )
+        _supabase_client = create_client(url, key, options=ClientOptions(httpx_client=_http_client))
+
+        logger.info(f"Supabase client initialized (HTTP/2, up to {_HTTP_MAX_CONNECTIONS} pooled connections)")
 
     return _supabase_client
 
 
+def get_pool() -> Optional[ThreadedConnectionPool]:
+    """
+    Get or create the direct Postgres connection pool
+
+    None if SUPABASE_DB_URL is not set, or if the pool could not be created;
+    callers then use PostgREST.
+    """
+    global _pg_pool, _pg_pool_failed
+
+    if _pg_pool is None:
+        dsn = os.environ.get("SUPABASE_DB_URL")
+        if not dsn or _pg_pool_failed:
+            return None
+
+        # Request threads can race on first use; only one of them builds the pool
+        with _pg_pool_lock:
+            if _pg_pool is None and not _pg_pool_failed:
+                try:
+                    # psycopg2 never uses server-side prepared statements, so this is also
+                    # safe behind the Supabase transaction pooler (port 6543)
+                    _pg_pool = ThreadedConnectionPool(
+                        _PG_POOL_MIN,
+                        _PG_POOL_MAX,
+                        dsn=dsn,
+                        connect_timeout=10,
+                        options=f"-c statement_timeout={_PG_STATEMENT_TIMEOUT_MS}"
+                    )
+                    logger.info(f"Postgres pool initialized ({_PG_POOL_MIN}-{_PG_POOL_MAX} connections)")
+                except Exception as e:
+                    # Don't pay the connect timeout on every call; stay on PostgREST until restart
+                    _pg_pool_failed = True
+                    logger.error(f"Could not connect to SUPABASE_DB_URL, using PostgREST instead: {e}")
+
+    return _pg_pool
+
+
+@contextmanager
+def get_conn():
+    """
+    Borrow a connection from the Postgres pool and return it afterwards
+
+    Yields None without SUPABASE_DB_URL. Work that was not committed is
+    rolled back when the connection goes back to the pool.
+    """
+    pool = get_pool()
+    if pool is None:
+        yield None
+        return
+
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+@contextmanager
+def pg_cursor():
+    """Borrow a pooled connection and yield a dict cursor, committing on success"""
+    with get_conn() as conn:
+        with conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                yield cur
+
+
+@contextmanager
+def transaction(durable: bool = True):
+    """
+    Run several writes in one Postgres transaction
+
+    Yields a pooled connection to pass as conn= to the create helpers that
+    accept it; commits on success and rolls back if the block raises.
+    durable=False skips waiting for the WAL flush on commit, for throwaway
+    data such as the demo seed.
+    Without SUPABASE_DB_URL this yields None and each write commits on its own.
+    """
+    with get_conn() as conn:
+        if conn is None:
+            yield None
+            return
+
+        with conn:
+            if not durable:
+                # SET LOCAL ends with the transaction, so the pooled conn is unaffected
+                with conn.cursor() as cur:
+                    cur.execute("SET LOCAL synchronous_commit TO OFF")
+            yield conn
+
+
+def _jsonable(row: Dict) -> Dict:
+    """Copy of row with datetimes as ISO strings, for PostgREST JSON bodies"""
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+
+
+def _chunks(seq: List, size: int = None):
+    """Yield consecutive slices of seq with at most size elements"""
+    size = size or _BULK_BATCH_SIZE
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def _returning_expr(table: str, returning: Sequence[str] = None) -> str:
+    """RETURNING expression giving PostgREST-shaped jsonb rows, limited to returning columns if given"""
+    if returning:
+        return "jsonb_build_object(" + ", ".join(f"'{column}', {column}" for column in returning) + ")"
+    return f"to_jsonb({table}.*)"
+
+
+def _insert_rows(conn, table: str, columns: Sequence[str], values: List[tuple],
+                 ignore_conflicts_on: str = None, returning: Sequence[str] = None) -> List[Dict]:
+    """
+    Insert value tuples on a direct connection, returning rows shaped like PostgREST results
+
+    returning limits the returned rows to those columns (default: all).
+    """
+    on_conflict = f" ON CONFLICT ({ignore_conflicts_on}) DO NOTHING" if ignore_conflicts_on else ""
+    returned = _returning_expr(table, returning)
+    with conn.cursor() as cur:
+        result = execute_values(
+            cur,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s{on_conflict} RETURNING {returned}",
+            values,
+            page_size=_BULK_BATCH_SIZE,
+            fetch=True
+        )
+    return [row[0] for row in result]
+
+
+def _insert_missing_rows(conn, table: str, columns: Sequence[str], values: List[tuple], key: str,
+                         returning: Sequence[str] = None) -> List[Dict]:
+    """
+    Insert only the value tuples whose key column value is not in table yet
+
+    For tables without a unique constraint to hang ON CONFLICT on. Rows are
+    typed by the table's own row type, so no per-column casts are needed.
+    """
+    returned = _returning_expr(table, returning)
+    column_list = ', '.join(columns)
+    query = (
+        f"INSERT INTO {table} ({column_list}) "
+        f"SELECT {column_list} FROM jsonb_populate_recordset(NULL::{table}, %s) AS v "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key} = v.{key}) "
+        f"RETURNING {returned}"
+    )
+    created = []
+    with conn.cursor() as cur:
+        for chunk in _chunks(values):
+            rows = [_jsonable(dict(zip(columns, row))) for row in chunk]
+            cur.execute(query, (Json(rows),))
+            created.extend(row[0] for row in cur.fetchall())
+    return created
+
+
+def _bulk_insert_rows(table: str, columns: Sequence[str], values: List[tuple], conn=None,
+                      ignore_conflicts_on: str = None, returning: Sequence[str] = None,
+                      skip_existing_on: str = None) -> Optional[List[Dict]]:
+    """
+    Insert value tuples in as few statements as possible and return the created rows
+
+    Uses conn if given (errors propagate so the caller's transaction rolls
+    back), else a pooled Postgres connection with multi-row VALUES, else a
+    single PostgREST request. returning narrows the rows sent back on the
+    Postgres paths; PostgREST always returns whole rows. skip_existing_on
+    names a (non-unique) column: rows whose value is already in the table are
+    not inserted. Returns None if the insert failed.
+    """
+    if not values:
+        return []
+    if conn is not None:
+        if skip_existing_on:
+            return _insert_missing_rows(conn, table, columns, values, skip_existing_on, returning)
+        return _insert_rows(conn, table, columns, values, ignore_conflicts_on, returning)
+
+    try:
+        if get_pool():
+            with transaction() as own_conn:
+                if skip_existing_on:
+                    return _insert_missing_rows(own_conn, table, columns, values, skip_existing_on, returning)
+                return _insert_rows(own_conn, table, columns, values, ignore_conflicts_on, returning)
+
+        supabase = get_supabase()
+        if skip_existing_on:
+            # No single-statement form over PostgREST: look the keys up first
+            key_index = list(columns).index(skip_existing_on)
+            keys = [row[key_index] for row in values]
+            result = supabase.table(table).select(skip_existing_on).in_(skip_existing_on, keys).execute()
+            existing = {row[skip_existing_on] for row in result.data}
+            values = [row for row in values if row[key_index] not in existing]
+
+        created = []
+        for chunk in _chunks(values):
+            chunk = [_jsonable(dict(zip(columns, row))) for row in chunk]
+            if ignore_conflicts_on:
+                query = supabase.table(table).upsert(chunk, on_conflict=ignore_conflicts_on, ignore_duplicates=True)
+            else:
+                query = supabase.table(table).insert(chunk)
+            result = query.execute()
+            created.extend(result.data or [])
+        return created
+    except Exception as e:
+        logger.error(f"Error bulk creating {len(values)} rows in {table}: {e}")
+        return None
+
+
+def _call_rows_function(function: str, rows: List[Dict], conn=None) -> Optional[List[Dict]]:
+    """
+    Call a SQL function taking a jsonb array of rows and return its result rows
+
+    Same connection rules, batching and error handling as _bulk_insert_rows;
+    on the PostgREST fallback this is one rpc call per batch.
+    """
+    if not rows:
+        return []
+    rows = [_jsonable(row) for row in rows]
+    query = f"SELECT to_jsonb(r.*) FROM {function}(%s) AS r"
+
+    def call(conn):
+        result = []
+        with conn.cursor() as cur:
+            for chunk in _chunks(rows):
+                cur.execute(query, (Json(chunk),))
+                result.extend(row[0] for row in cur.fetchall())
+        return result
+
+    if conn is not None:
+        return call(conn)
+
+    try:
+        if get_pool():
+            with transaction() as own_conn:
+                return call(own_conn)
+
+        supabase = get_supabase()
+        result = []
+        for chunk in _chunks(rows):
+            result.extend(supabase.rpc(function, {'rows': chunk}).execute().data or [])
+        return result
+    except Exception as e:
+        logger.error(f"Error calling {function} with {len(rows)} rows: {e}")
+        return None
+
+
 # ============================================================================
 # SETTINGS
 # ============================================================================
 
+def invalidate_settings_cache(key: str = None) -> None:
+    """Drop one cached setting, or the whole settings cache"""
+    if key is None:
+        _settings_cache.clear()
+    else:
+        _settings_cache.pop(key, None)
+
+
 def get_setting(key: str) -> Optional[str]:
     """Get a setting value by key"""
+    cached = _settings_cache.get(key)
+    if cached and time.monotonic() - cached[0] < _SETTINGS_TTL:
+        return cached[1]
+
     try:
-        supabase = get_supabase()
-        result = supabase.table('settings').select('value').eq('key', key).maybeSingle().execute()
-        return result.data['value'] if result.data else None
+        if get_pool():
+            with pg_cursor() as cur:
+                cur.execute("SELECT value FROM settings WHERE key = %s", (key,))
+                row = cur.fetchone()
+            value = row['value'] if row else None
+        else:
+            supabase = get_supabase()
+            result = supabase.table('settings').select('value').eq('key', key).maybeSingle().execute()
+            value = result.data['value'] if result.data else None
+        _settings_cache[key] = (time.monotonic(), value)
+        return value
     except Exception as e:
         logger.error(f"Error getting setting {key}: {e}")
         return None
@@ -51,23 +385,36 @@ def set_setting(key: str, value: str, description: str = None) -> bool:
     """Set a setting value"""
     try:
         supabase = get_supabase()
-        data = {'key': key, 'value': value, 'updated_at': datetime.utcnow().isoformat()}
+        data = {'key': key, 'value': value}
         if description:
             data['description'] = description
 
         supabase.table('settings').upsert(data).execute()
+        _settings_cache[key] = (time.monotonic(), value)
         return True
     except Exception as e:
         logger.error(f"Error setting {key}: {e}")
+        invalidate_settings_cache(key)
         return False
 
 
 def get_all_settings() -> Dict[str, str]:
     """Get all settings as a dictionary"""
     try:
-        supabase = get_supabase()
-        result = supabase.table('settings').select('key, value').execute()
-        return {row['key']: row['value'] for row in result.data}
+        if get_pool():
+            with pg_cursor() as cur:
+                cur.execute("SELECT settings_as_json() AS settings")
+                settings = cur.fetchone()['settings']
+        else:
+            supabase = get_supabase()
+            result = supabase.rpc('settings_as_json').execute()
+            settings = result.data or {}
+
+        now = time.monotonic()
+        for key, value in settings.items():
+            _settings_cache[key] = (now, value)
+
+        return settings
     except Exception as e:
         logger.error(f"Error getting all settings: {e}")
         return {}
@@ -81,7 +428,7 @@ def get_items(limit: int = 50, filters: Dict[str, Any] = None) -> List[Dict]:
     """Get items with optional filters"""
     try:
         supabase = get_supabase()
-        query = supabase.table('items').select('*')
+        query = supabase.table('items').select(_ITEM_LIST_COLS)
 
         if filters:
             if 'listing_status' in filters:
@@ -91,7 +438,7 @@ def get_items(limit: int = 50, filters: Dict[str, Any] = None) -> List[Dict]:
             if 'brand' in filters:
                 query = query.ilike('brand', f"%{filters['brand']}%")
 
-        query = query.order('created_at', desc=True).limit(limit)
+        query = query.order('created_at', desc=True).range(0, limit - 1)
         result = query.execute()
         return result.data
     except Exception as e:
@@ -124,6 +471,14 @@ def get_item_by_sku(sku: str) -> Optional[Dict]:
 def get_item_by_vinted_id(vinted_item_id: str) -> Optional[Dict]:
     """Get item by Vinted item ID (for integration)"""
     try:
+        if get_pool():
+            with pg_cursor() as cur:
+                # to_jsonb keeps the row shaped like the PostgREST result below
+                cur.execute("SELECT to_jsonb(items.*) AS item FROM items WHERE vinted_item_id = %s LIMIT 1",
+                            (vinted_item_id,))
+                row = cur.fetchone()
+                return row['item'] if row else None
+
         supabase = get_supabase()
         result = supabase.table('items').select('*').eq('vinted_item_id', vinted_item_id).maybeSingle().execute()
         return result.data
@@ -132,14 +487,34 @@ def get_item_by_vinted_id(vinted_item_id: str) -> Optional[Dict]:
         return None
 
 
-def create_item(item_data: Dict) -> Optional[Dict]:
+def create_item(item_data: Dict, conn=None) -> Optional[Dict]:
     """Create a new item"""
+    created = _bulk_insert_rows('items', tuple(item_data), [tuple(item_data.values())], conn)
+    return created[0] if created else None
+
+
+def create_items_bulk_rows(columns: Sequence[str], rows: List[tuple], ignore_conflicts_on: str = None,
+                           conn=None, returning: Sequence[str] = None) -> Optional[List[Dict]]:
+    """
+    Create several items in a single insert, from one value tuple per item in columns order
+
+    If ignore_conflicts_on names a unique column, rows that clash on it are
+    skipped by Postgres and left out of the returned list. returning names the
+    columns wanted back for each created item (default: all).
+    """
+    return _bulk_insert_rows('items', columns, rows, conn, ignore_conflicts_on, returning)
+
+
+def import_items_bulk(items: List[Dict]) -> Optional[List[Dict]]:
+    """Import normalized Vinted items in one RPC call, skipping already-imported ones"""
+    if not items:
+        return []
     try:
         supabase = get_supabase()
-        result = supabase.table('items').insert(item_data).execute()
-        return result.data[0] if result.data else None
+        result = supabase.rpc('import_items_bulk', {'rows': items}).execute()
+        return result.data or []
     except Exception as e:
-        logger.error(f"Error creating item: {e}")
+        logger.error(f"Error importing {len(items)} items: {e}")
         return None
 
 
@@ -147,7 +522,6 @@ def update_item(item_id: str, item_data: Dict) -> bool:
     """Update an item"""
     try:
         supabase = get_supabase()
-        item_data['updated_at'] = datetime.utcnow().isoformat()
         supabase.table('items').update(item_data).eq('id', item_id).execute()
         return True
     except Exception as e:
@@ -169,26 +543,21 @@ def delete_item(item_id: str) -> bool:
 def get_items_stats() -> Dict:
     """Get inventory statistics"""
     try:
-        supabase = get_supabase()
-
-        # Total items
-        all_items = supabase.table('items').select('listing_status, profit').execute()
-        total = len(all_items.data)
-
-        # Count by status
-        listed = sum(1 for item in all_items.data if item['listing_status'] == 'Listed')
-        sold = sum(1 for item in all_items.data if item['listing_status'] == 'Sold')
-        draft = sum(1 for item in all_items.data if item['listing_status'] == 'Draft')
-
-        # Total profit (from sold items)
-        total_profit = sum(float(item['profit'] or 0) for item in all_items.data if item['listing_status'] == 'Sold')
+        if get_pool():
+            with pg_cursor() as cur:
+                cur.execute("SELECT * FROM items_stats()")
+                stats = cur.fetchone()
+        else:
+            supabase = get_supabase()
+            result = supabase.rpc('items_stats').execute()
+            stats = result.data[0]
 
         return {
-            'total_items': total,
-            'listed': listed,
-            'sold': sold,
-            'draft': draft,
-            'total_profit': round(total_profit, 2)
+            'total_items': stats['total_items'],
+            'listed': stats['listed'],
+            'sold': stats['sold'],
+            'draft': stats['draft'],
+            'total_profit': float(stats['total_profit'] or 0)
         }
     except Exception as e:
         logger.error(f"Error getting items stats: {e}")
@@ -203,7 +572,7 @@ def get_sales(limit: int = 50, filters: Dict[str, Any] = None) -> List[Dict]:
     """Get sales with optional filters"""
     try:
         supabase = get_supabase()
-        query = supabase.table('sales').select('*')
+        query = supabase.table('sales').select(_SALE_LIST_COLS)
 
         if filters:
             if 'platform' in filters:
@@ -211,7 +580,7 @@ def get_sales(limit: int = 50, filters: Dict[str, Any] = None) -> List[Dict]:
             if 'payout_status' in filters:
                 query = query.eq('payout_status', filters['payout_status'])
 
-        query = query.order('date_sold', desc=True).limit(limit)
+        query = query.order('date_sold', desc=True).range(0, limit - 1)
         result = query.execute()
         return result.data
     except Exception as e:
@@ -230,22 +599,27 @@ def get_sale_by_id(sale_id: str) -> Optional[Dict]:
         return None
 
 
-def create_sale(sale_data: Dict) -> Optional[Dict]:
+def create_sale(sale_data: Dict, conn=None) -> Optional[Dict]:
     """Create a new sale"""
-    try:
-        supabase = get_supabase()
-        result = supabase.table('sales').insert(sale_data).execute()
-        return result.data[0] if result.data else None
-    except Exception as e:
-        logger.error(f"Error creating sale: {e}")
-        return None
+    created = _bulk_insert_rows('sales', tuple(sale_data), [tuple(sale_data.values())], conn)
+    return created[0] if created else None
+
+
+def create_sales_with_shipments(sales: List[Dict], conn=None) -> Optional[List[Dict]]:
+    """
+    Create sales and one shipment each in a single statement
+
+    Rows are sale fields plus buyer_address, carrier, shipment_status and
+    delivered_at; Postgres picks random order_id and tracking_number values.
+    Returns {'sale': ..., 'shipment': ...} per row.
+    """
+    return _call_rows_function('create_sales_with_shipments', sales, conn)
 
 
 def update_sale(sale_id: str, sale_data: Dict) -> bool:
     """Update a sale"""
     try:
         supabase = get_supabase()
-        sale_data['updated_at'] = datetime.utcnow().isoformat()
         supabase.table('sales').update(sale_data).eq('id', sale_id).execute()
         return True
     except Exception as e:
@@ -256,21 +630,20 @@ def update_sale(sale_id: str, sale_data: Dict) -> bool:
 def get_sales_stats() -> Dict:
     """Get sales statistics"""
     try:
-        supabase = get_supabase()
-        result = supabase.table('sales').select('net_profit, sale_price, platform').execute()
-
-        total_sales = len(result.data)
-        total_revenue = sum(float(sale['sale_price'] or 0) for sale in result.data)
-        total_profit = sum(float(sale['net_profit'] or 0) for sale in result.data)
-
-        # Average profit
-        avg_profit = total_profit / total_sales if total_sales > 0 else 0
+        if get_pool():
+            with pg_cursor() as cur:
+                cur.execute("SELECT * FROM sales_stats()")
+                stats = cur.fetchone()
+        else:
+            supabase = get_supabase()
+            result = supabase.rpc('sales_stats').execute()
+            stats = result.data[0]
 
         return {
-            'total_sales': total_sales,
-            'total_revenue': round(total_revenue, 2),
-            'total_profit': round(total_profit, 2),
-            'avg_profit': round(avg_profit, 2)
+            'total_sales': stats['total_sales'],
+            'total_revenue': float(stats['total_revenue'] or 0),
+            'total_profit': float(stats['total_profit'] or 0),
+            'avg_profit': float(stats['avg_profit'] or 0)
         }
     except Exception as e:
         logger.error(f"Error getting sales stats: {e}")
@@ -285,12 +658,12 @@ def get_shipments(status_filter: str = None, limit: int = 50) -> List[Dict]:
     """Get shipments, optionally filtered by status"""
     try:
         supabase = get_supabase()
-        query = supabase.table('shipments').select('*')
+        query = supabase.table('shipments').select(_SHIPMENT_LIST_COLS)
 
         if status_filter:
             query = query.eq('status', status_filter)
 
-        query = query.order('created_at', desc=True).limit(limit)
+        query = query.order('created_at', desc=True).range(0, limit - 1)
         result = query.execute()
         return result.data
     except Exception as e:
@@ -298,22 +671,16 @@ def get_shipments(status_filter: str = None, limit: int = 50) -> List[Dict]:
         return []
 
 
-def create_shipment(shipment_data: Dict) -> Optional[Dict]:
+def create_shipment(shipment_data: Dict, conn=None) -> Optional[Dict]:
     """Create a new shipment"""
-    try:
-        supabase = get_supabase()
-        result = supabase.table('shipments').insert(shipment_data).execute()
-        return result.data[0] if result.data else None
-    except Exception as e:
-        logger.error(f"Error creating shipment: {e}")
-        return None
+    created = _bulk_insert_rows('shipments', tuple(shipment_data), [tuple(shipment_data.values())], conn)
+    return created[0] if created else None
 
 
 def update_shipment(shipment_id: str, shipment_data: Dict) -> bool:
     """Update a shipment"""
     try:
         supabase = get_supabase()
-        shipment_data['updated_at'] = datetime.utcnow().isoformat()
         supabase.table('shipments').update(shipment_data).eq('id', shipment_id).execute()
         return True
     except Exception as e:
@@ -329,12 +696,12 @@ def get_return_cases(status_filter: str = None, limit: int = 50) -> List[Dict]:
     """Get return cases, optionally filtered by status"""
     try:
         supabase = get_supabase()
-        query = supabase.table('return_cases').select('*')
+        query = supabase.table('return_cases').select(_RETURN_CASE_LIST_COLS)
 
         if status_filter:
             query = query.eq('status', status_filter)
 
-        query = query.order('created_at', desc=True).limit(limit)
+        query = query.order('created_at', desc=True).range(0, limit - 1)
         result = query.execute()
         return result.data
     except Exception as e:
@@ -342,22 +709,28 @@ def get_return_cases(status_filter: str = None, limit: int = 50) -> List[Dict]:
         return []
 
 
-def create_return_case(return_data: Dict) -> Optional[Dict]:
-    """Create a new return case"""
-    try:
-        supabase = get_supabase()
-        result = supabase.table('return_cases').insert(return_data).execute()
-        return result.data[0] if result.data else None
-    except Exception as e:
-        logger.error(f"Error creating return case: {e}")
-        return None
+def create_return_case(return_data: Dict, conn=None, skip_existing_on: str = None) -> Optional[Dict]:
+    """Create a new return case (None if skip_existing_on matched an existing one)"""
+    created = _bulk_insert_rows('return_cases', tuple(return_data), [tuple(return_data.values())], conn,
+                                skip_existing_on=skip_existing_on)
+    return created[0] if created else None
+
+
+def create_return_cases_bulk_rows(columns: Sequence[str], rows: List[tuple], conn=None,
+                                  skip_existing_on: str = None) -> Optional[List[Dict]]:
+    """
+    Create several return cases in a single insert, from one value tuple per case in columns order
+
+    If skip_existing_on names a column (e.g. 'item_name'), cases whose value is
+    already taken are skipped and left out of the returned list.
+    """
+    return _bulk_insert_rows('return_cases', columns, rows, conn, skip_existing_on=skip_existing_on)
 
 
 def update_return_case(return_id: str, return_data: Dict) -> bool:
     """Update a return case"""
     try:
         supabase = get_supabase()
-        return_data['updated_at'] = datetime.utcnow().isoformat()
         supabase.table('return_cases').update(return_data).eq('id', return_id).execute()
         return True
     except Exception as e:
@@ -373,12 +746,12 @@ def get_tasks(status_filter: str = None, limit: int = 50) -> List[Dict]:
     """Get tasks, optionally filtered by status"""
     try:
         supabase = get_supabase()
-        query = supabase.table('tasks').select('*')
+        query = supabase.table('tasks').select(_TASK_LIST_COLS)
 
         if status_filter:
             query = query.eq('status', status_filter)
 
-        query = query.order('created_at', desc=True).limit(limit)
+        query = query.order('created_at', desc=True).range(0, limit - 1)
         result = query.execute()
         return result.data
     except Exception as e:
@@ -386,22 +759,27 @@ def get_tasks(status_filter: str = None, limit: int = 50) -> List[Dict]:
         return []
 
 
-def create_task(task_data: Dict) -> Optional[Dict]:
+def create_task(task_data: Dict, conn=None) -> Optional[Dict]:
     """Create a new task"""
-    try:
-        supabase = get_supabase()
-        result = supabase.table('tasks').insert(task_data).execute()
-        return result.data[0] if result.data else None
-    except Exception as e:
-        logger.error(f"Error creating task: {e}")
-        return None
+    created = _bulk_insert_rows('tasks', tuple(task_data), [tuple(task_data.values())], conn)
+    return created[0] if created else None
+
+
+def create_tasks_bulk_rows(columns: Sequence[str], rows: List[tuple], conn=None,
+                           skip_existing_on: str = None) -> Optional[List[Dict]]:
+    """
+    Create several tasks in a single insert, from one value tuple per task in columns order
+
+    If skip_existing_on names a column (e.g. 'title'), tasks whose value is
+    already taken are skipped and left out of the returned list.
+    """
+    return _bulk_insert_rows('tasks', columns, rows, conn, skip_existing_on=skip_existing_on)
 
 
 def update_task(task_id: str, task_data: Dict) -> bool:
     """Update a task"""
     try:
         supabase = get_supabase()
-        task_data['updated_at'] = datetime.utcnow().isoformat()
         supabase.table('tasks').update(task_data).eq('id', task_id).execute()
         return True
     except Exception as e:
@@ -424,28 +802,149 @@ def delete_task(task_id: str) -> bool:
 # VINTED INTEGRATION LOGS
 # ============================================================================
 
-def log_vinted_event(event_type: str, status: str, message: str, data: Dict = None) -> bool:
-    """Log a Vinted integration event"""
+# Log rows are buffered and written by a background thread every
+# _LOG_FLUSH_INTERVAL seconds, or sooner once _LOG_FLUSH_SIZE rows are waiting
+_LOG_FLUSH_INTERVAL = 2
+_LOG_FLUSH_SIZE = 50
+# Upper bound on waiting rows, so an unreachable database can't grow memory forever
+_LOG_BUFFER_MAX = 10000
+# Time budget (seconds) for the last flush at process exit
+_LOG_EXIT_FLUSH_TIMEOUT = 5
+LOG_BUFFER: queue.Queue = queue.Queue(maxsize=_LOG_BUFFER_MAX)
+_log_flush_requested = threading.Event()
+_log_flusher: Optional[threading.Thread] = None
+_log_flusher_lock = threading.Lock()
+
+
+def _log_flush_loop():
+    """Background loop writing buffered Vinted log rows"""
+    while True:
+        _log_flush_requested.wait(_LOG_FLUSH_INTERVAL)
+        _log_flush_requested.clear()
+        flush_vinted_logs()
+
+
+def _buffer_log_rows(rows: List[Dict]) -> bool:
+    """Queue log rows and make sure the flusher thread is running; False if the buffer was full"""
+    global _log_flusher
+
+    # Stamp rows now, so their order and time survive being inserted together
+    created_at = datetime.now(timezone.utc).isoformat()
+    stamped = [{'created_at': created_at, **row} for row in rows]
+    buffered = _queue_log_rows(stamped)
+
+    if _log_flusher is None:
+        with _log_flusher_lock:
+            if _log_flusher is None:
+                _log_flusher = threading.Thread(target=_log_flush_loop, name="vinted-log-flusher", daemon=True)
+                _log_flusher.start()
+
+    if LOG_BUFFER.qsize() >= _LOG_FLUSH_SIZE:
+        _log_flush_requested.set()
+
+    return buffered
+
+
+def _queue_log_rows(rows: List[Dict]) -> bool:
+    """Put rows on LOG_BUFFER, dropping (and logging) whatever doesn't fit"""
+    for i, row in enumerate(rows):
+        try:
+            LOG_BUFFER.put_nowait(row)
+        except queue.Full:
+            logger.error(f"Vinted log buffer full, dropped {len(rows) - i} log rows")
+            return False
+    return True
+
+
+def flush_vinted_logs() -> bool:
+    """Write all buffered Vinted log rows in a single insert"""
+    return _flush_log_rows(requeue=True)
+
+
+def _flush_log_rows(requeue: bool, deadline: float = None) -> bool:
+    """
+    Drain LOG_BUFFER into one insert
+
+    If the database can't be reached the rows go back on the buffer (requeue)
+    or are dropped; if the insert is rejected, rows are retried one by one so
+    only the bad ones are lost. deadline (time.monotonic()) stops those retries.
+    """
+    rows = []
+    while True:
+        try:
+            rows.append(LOG_BUFFER.get_nowait())
+        except queue.Empty:
+            break
+
+    if not rows:
+        return True
+
+    def unreachable(pending: List[Dict], e: Exception) -> bool:
+        # Retrying row by row would only multiply the timeouts
+        if requeue and _queue_log_rows(pending):
+            logger.error(f"Database unreachable, keeping {len(pending)} Vinted log rows for the next flush: {e}")
+        else:
+            logger.error(f"Database unreachable, dropped {len(pending)} Vinted log rows: {e}")
+        return False
+
     try:
-        supabase = get_supabase()
-        log_data = {
-            'event_type': event_type,
-            'status': status,
-            'message': message,
-            'data': data
-        }
-        supabase.table('vinted_integration_logs').insert(log_data).execute()
+        get_supabase().table('vinted_integration_logs').insert(rows).execute()
         return True
+    except httpx.TransportError as e:
+        return unreachable(rows, e)
     except Exception as e:
-        logger.error(f"Error logging Vinted event: {e}")
-        return False
+        logger.error(f"Error writing {len(rows)} Vinted log rows, retrying one by one: {e}")
+
+    # One bad row fails the whole insert; retry individually so only that row is lost
+    written = True
+    for i, row in enumerate(rows):
+        if deadline is not None and time.monotonic() > deadline:
+            logger.error(f"Out of time, dropped {len(rows) - i} Vinted log rows")
+            return False
+        try:
+            get_supabase().table('vinted_integration_logs').insert(row).execute()
+        except httpx.TransportError as e:
+            return unreachable(rows[i:], e)
+        except Exception as e:
+            logger.error(f"Error logging Vinted event {row.get('event_type')}: {e}")
+            written = False
+    return written
+
+
+def _flush_vinted_logs_at_exit():
+    """Last flush on exit, time-boxed so an unreachable database can't hold up the process"""
+    if LOG_BUFFER.empty():
+        return
+    if _http_client is not None:
+        _http_client.timeout = httpx.Timeout(_LOG_EXIT_FLUSH_TIMEOUT)
+    _flush_log_rows(requeue=False, deadline=time.monotonic() + _LOG_EXIT_FLUSH_TIMEOUT)
+
+
+atexit.register(_flush_vinted_logs_at_exit)
+
+
+def log_vinted_event(event_type: str, status: str, message: str, data: Dict = None) -> bool:
+    """Log a Vinted integration event (buffered, written in the background)"""
+    return _buffer_log_rows([{
+        'event_type': event_type,
+        'status': status,
+        'message': message,
+        'data': data
+    }])
+
+
+def log_vinted_events_bulk(events: List[Dict]) -> bool:
+    """Log several Vinted integration events (buffered, written in the background)"""
+    if not events:
+        return True
+    return _buffer_log_rows(events)
 
 
 def get_vinted_logs(limit: int = 100) -> List[Dict]:
     """Get recent Vinted integration logs"""
     try:
         supabase = get_supabase()
-        result = supabase.table('vinted_integration_logs').select('*').order('created_at', desc=True).limit(limit).execute()
+        result = supabase.table('vinted_integration_logs').select(_VINTED_LOG_LIST_COLS).order('created_at', desc=True).range(0, limit - 1).execute()
         return result.data
     except Exception as e:
         logger.error(f"Error getting Vinted logs: {e}")
@@ -7,7 +7,7 @@ This module wraps the existing pyVintedVN library and provides:
 3. Configuration and status tracking
 """
 
-from .adapter import VintedAdapter
+from .adapter import VintedAdapter, get_vinted_adapter
 from .normalizer import VintedNormalizer
 
-__all__ = ['VintedAdapter', 'VintedNormalizer']
+__all__ = ['VintedAdapter', 'VintedNormalizer', 'get_vinted_adapter']
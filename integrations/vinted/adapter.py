@@ -7,6 +7,8 @@ Handles syncing Vinted items into the dashboard inventory.
 
 import sys
 import os
+import functools
+import concurrent.futures
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -20,6 +22,13 @@ from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Process-wide integration flag, None until first read from settings
+_enabled: Optional[bool] = None
+
+# Most items the Vinted API returns per page; sync_query only paginates (and
+# overlaps imports with fetches) when items_limit is larger than this
+_MAX_PAGE_SIZE = 96
+
 
 class VintedAdapter:
     """
@@ -30,17 +39,37 @@ class VintedAdapter:
     def __init__(self):
         self.vinted_client = Vinted()
         self.normalizer = VintedNormalizer()
-        self.enabled = self._check_enabled()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether integration is enabled"""
+        return self._check_enabled()
 
     def _check_enabled(self) -> bool:
-        """Check if Vinted integration is enabled"""
+        """Check if Vinted integration is enabled, querying settings only on cold start"""
+        global _enabled
+
+        if _enabled is not None:
+            return _enabled
+
         try:
             enabled = db.get_setting('vinted_integration_enabled')
-            return enabled == 'true'
+            if enabled is None:
+                return False
+            _enabled = enabled == 'true'
+            return _enabled
         except Exception as e:
             logger.error(f"Error checking Vinted integration status: {e}")
             return False
 
+    def refresh_enabled(self) -> bool:
+        """Re-read the enabled flag from settings (e.g. after another process changed it)"""
+        global _enabled
+
+        _enabled = None
+        db.invalidate_settings_cache('vinted_integration_enabled')
+        return self._check_enabled()
+
     def is_enabled(self) -> bool:
         """Public method to check if integration is enabled"""
         return self.enabled
@@ -86,61 +115,39 @@ class VintedAdapter:
         result = {'success': True, 'imported': 0, 'skipped': 0, 'errors': 0, 'items': []}
 
         try:
-            # Fetch items from Vinted
+            # Fetch items from Vinted page by page; each page is imported on a
+            # background worker while the next page is being fetched
             logger.info(f"Fetching Vinted items for query {query_id}")
-            vinted_items = self.vinted_client.items.search(query_url, nbr_items=items_limit)
+            pending = []
+            fetched = 0
+            banword_matcher = None
 
-            # Get banwords from settings
-            banwords_str = db.get_setting('banwords') or ''
-            banwords = [w.strip().lower() for w in banwords_str.split('|||') if w.strip()]
+            # One request whenever the limit fits in a page: the API is rate limited
+            # and new listings shift the offsets between page requests
+            per_page = min(items_limit, _MAX_PAGE_SIZE)
 
-            for vinted_item in vinted_items:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
                 try:
-                    # Check if we should import this item
-                    should_import, reason = self.normalizer.can_import_item(vinted_item, banwords=banwords)
-
-                    if not should_import:
-                        result['skipped'] += 1
-                        logger.debug(f"Skipped Vinted item {vinted_item.id}: {reason}")
-                        continue
-
-                    # Check if item already exists
-                    existing = db.get_item_by_vinted_id(str(vinted_item.id))
-                    if existing:
-                        result['skipped'] += 1
-                        logger.debug(f"Item {vinted_item.id} already in database")
-                        continue
-
-                    # Normalize the Vinted item to our format
-                    normalized_item = self.normalizer.normalize_item(vinted_item, query_id)
-
-                    if not normalized_item:
-                        result['errors'] += 1
-                        logger.error(f"Failed to normalize Vinted item {vinted_item.id}")
-                        continue
-
-                    # Create item in database
-                    created_item = db.create_item(normalized_item)
-
-                    if created_item:
-                        result['imported'] += 1
-                        result['items'].append(created_item)
-                        logger.info(f"Imported Vinted item {vinted_item.id} as {created_item['sku']}")
-
-                        # Log the event
-                        db.log_vinted_event(
-                            event_type='item_imported',
-                            status='Success',
-                            message=f"Imported item {vinted_item.title}",
-                            data={'vinted_id': str(vinted_item.id), 'sku': created_item['sku']}
-                        )
-                    else:
-                        result['errors'] += 1
-                        logger.error(f"Failed to create item in database for Vinted item {vinted_item.id}")
-
-                except Exception as e:
-                    result['errors'] += 1
-                    logger.error(f"Error processing Vinted item: {e}", exc_info=True)
+                    pages = self.vinted_client.items.iter_pages(query_url, nbr_items=items_limit, per_page=per_page)
+                    for vinted_items in pages:
+                        # Only load banwords once there is something to filter
+                        if not fetched:
+                            banword_matcher = self._load_banword_matcher()
+                        fetched += len(vinted_items)
+
+                        to_insert = self._prepare_items(vinted_items, query_id, banword_matcher, result)
+                        if to_insert:
+                            pending.append((executor.submit(db.import_items_bulk, to_insert), to_insert))
+                finally:
+                    # Submitted imports complete even if a later page fails; count and log them
+                    for future, to_insert in pending:
+                        self._record_import(future.result(), to_insert, query_id, result)
+
+            # Nothing found: record the sync time and stop, without logging
+            if not fetched:
+                logger.info(f"No Vinted items found for query {query_id}")
+                db.set_setting('vinted_last_sync', str(int(datetime.now().timestamp())))
+                return result
 
             # Update last sync time
             db.set_setting('vinted_last_sync', str(int(datetime.now().timestamp())))
@@ -168,11 +175,73 @@ class VintedAdapter:
 
         return result
 
+    def _load_banword_matcher(self):
+        """Get banwords from settings, compiled into a single matcher"""
+        banwords_str = db.get_setting('banwords') or ''
+        banwords = [w.strip().lower() for w in banwords_str.split('|||') if w.strip()]
+        return self.normalizer.compile_banwords(banwords)
+
+    def _prepare_items(self, vinted_items: List, query_id: int, banword_matcher, result: Dict) -> List[Dict]:
+        """Filter and normalize a page of Vinted items, counting skips and errors in result"""
+        to_insert = []
+
+        for vinted_item in vinted_items:
+            try:
+                # Check if we should import this item
+                should_import, reason = self.normalizer.can_import_item(vinted_item, banword_matcher=banword_matcher)
+
+                if not should_import:
+                    result['skipped'] += 1
+                    logger.debug(f"Skipped Vinted item {vinted_item.id}: {reason}")
+                    continue
+
+                # Normalize the Vinted item to our format
+                normalized_item = self.normalizer.normalize_item(vinted_item, query_id)
+
+                if not normalized_item:
+                    result['errors'] += 1
+                    logger.error(f"Failed to normalize Vinted item {vinted_item.id}")
+                    continue
+
+                to_insert.append(normalized_item)
+
+            except Exception as e:
+                result['errors'] += 1
+                logger.error(f"Error processing Vinted item: {e}", exc_info=True)
+
+        return to_insert
+
+    def _record_import(self, created_items: Optional[List[Dict]], to_insert: List[Dict], query_id: int, result: Dict):
+        """Count an import batch in result and log the imported items"""
+        if created_items is None:
+            result['errors'] += len(to_insert)
+            logger.error(f"Failed to create {len(to_insert)} items in database for query {query_id}")
+            return
+
+        # Postgres skips already-imported items
+        result['imported'] += len(created_items)
+        result['skipped'] += len(to_insert) - len(created_items)
+        result['items'].extend(created_items)
+        logger.info(f"Imported {len(created_items)} Vinted items for query {query_id}")
+
+        db.log_vinted_events_bulk([
+            {
+                'event_type': 'item_imported',
+                'status': 'Success',
+                'message': f"Imported item {item['item_name']}",
+                'data': {'vinted_id': item['vinted_item_id'], 'sku': item['sku']}
+            }
+            for item in created_items
+        ])
+
     def enable_integration(self) -> bool:
         """Enable Vinted integration"""
+        global _enabled
+
         try:
-            db.set_setting('vinted_integration_enabled', 'true')
-            self.enabled = True
+            if not db.set_setting('vinted_integration_enabled', 'true'):
+                return False
+            _enabled = True
             logger.info("Vinted integration enabled")
 
             db.log_vinted_event(
@@ -187,9 +256,12 @@ class VintedAdapter:
 
     def disable_integration(self) -> bool:
         """Disable Vinted integration"""
+        global _enabled
+
         try:
-            db.set_setting('vinted_integration_enabled', 'false')
-            self.enabled = False
+            if not db.set_setting('vinted_integration_enabled', 'false'):
+                return False
+            _enabled = False
             logger.info("Vinted integration disabled")
 
             db.log_vinted_event(
@@ -240,3 +312,9 @@ class VintedAdapter:
             )
 
             return {'success': False, 'message': str(e)}
+
+
+@functools.lru_cache(maxsize=1)
+def get_vinted_adapter() -> VintedAdapter:
+    """Get the shared VintedAdapter, created on first use"""
+    return VintedAdapter()
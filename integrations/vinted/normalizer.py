@@ -5,8 +5,9 @@ Converts Vinted API data structures into internal dashboard models.
 This creates a clean separation between the Vinted API and our app.
 """
 
+import re
 from datetime import datetime
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Pattern
 from logger import get_logger
 import uuid
 
@@ -16,16 +17,6 @@ logger = get_logger(__name__)
 class VintedNormalizer:
     """Normalizes Vinted data into internal Item/Sale models"""
 
-    @staticmethod
-    def generate_sku(vinted_item_id: str, brand: str = None) -> str:
-        """Generate a SKU for a Vinted item"""
-        prefix = "VINT"
-        if brand:
-            # Use first 3 letters of brand, uppercase
-            brand_code = brand[:3].upper().replace(" ", "")
-            prefix = f"VINT-{brand_code}"
-        return f"{prefix}-{vinted_item_id}"
-
     @staticmethod
     def normalize_item(vinted_item: Any, query_id: int = None) -> Dict:
         """
@@ -39,8 +30,7 @@ class VintedNormalizer:
             Dictionary ready for database.create_item()
         """
         try:
-            # Extract data from the Vinted item
-            sku = VintedNormalizer.generate_sku(str(vinted_item.id), vinted_item.brand_title)
+            # SKU is assigned by the items_set_vinted_sku trigger on insert
 
             # Map condition if available (Vinted doesn't always provide this in the item object)
             # Default to "Good" for sourced items
@@ -52,7 +42,6 @@ class VintedNormalizer:
 
             # Create the normalized item
             item_data = {
-                'sku': sku,
                 'item_name': vinted_item.title,
                 'category': None,  # Vinted doesn't expose category in simple search
                 'size': vinted_item.size_title if hasattr(vinted_item, 'size_title') and vinted_item.size_title else None,
@@ -99,7 +88,23 @@ class VintedNormalizer:
         }
 
     @staticmethod
-    def can_import_item(vinted_item: Any, allowlist: list = None, banwords: list = None) -> tuple[bool, Optional[str]]:
+    def compile_banwords(banwords: list) -> Optional[Pattern]:
+        """
+        Compile banned words into a single case-insensitive regex
+
+        Args:
+            banwords: List of banned words in titles
+
+        Returns:
+            Compiled pattern, or None if there are no banwords
+        """
+        if not banwords:
+            return None
+        return re.compile('|'.join(re.escape(word) for word in banwords), re.IGNORECASE)
+
+    @staticmethod
+    def can_import_item(vinted_item: Any, allowlist: list = None, banwords: list = None,
+                        banword_matcher: Pattern = None) -> tuple[bool, Optional[str]]:
         """
         Check if a Vinted item should be imported
 
@@ -107,12 +112,17 @@ class VintedNormalizer:
             vinted_item: Item from pyVintedVN
             allowlist: List of allowed country codes (or None for all)
             banwords: List of banned words in titles
+            banword_matcher: Pattern from compile_banwords(), used instead of banwords if given
 
         Returns:
             Tuple of (should_import: bool, reason: Optional[str])
         """
         # Check banwords
-        if banwords:
+        if banword_matcher is not None:
+            match = banword_matcher.search(vinted_item.title)
+            if match:
+                return False, f"Title contains banword: {match.group(0).lower()}"
+        elif banwords:
             title_lower = vinted_item.title.lower()
             for word in banwords:
                 if word.lower() in title_lower:
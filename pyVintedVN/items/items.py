@@ -2,7 +2,7 @@ from pyVintedVN.items.item import Item
 from pyVintedVN.requester import requester
 from urllib.parse import urlparse, parse_qsl
 from requests.exceptions import HTTPError
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from pyVintedVN.settings import Urls
 
 
@@ -73,6 +73,45 @@ class Items:
         except HTTPError as err:
             raise err
 
+    def iter_pages(
+        self, url: str, nbr_items: int = 20, per_page: int = 96
+    ) -> Iterator[List[Item]]:
+        """
+        Yield search results page by page until nbr_items have been returned.
+
+        Each page is requested only when the previous one has been consumed,
+        so callers can process a page while deciding whether to fetch more.
+
+        Args:
+            url (str): The URL of the search on Vinted.
+            nbr_items (int, optional): Total number of items to return. Defaults to 20.
+            per_page (int, optional): Items requested per page; the last page is
+                trimmed to nbr_items. Defaults to 96.
+
+        Yields:
+            List[Item]: The Item objects of one result page.
+
+        Raises:
+            HTTPError: If a request to the Vinted API fails.
+        """
+        page = 1
+        remaining = nbr_items
+
+        while remaining > 0:
+            # per_page stays fixed: Vinted offsets page N by (N - 1) * per_page
+            items = self.search(url, nbr_items=per_page, page=page)
+            if not items:
+                return
+
+            yield items[:remaining]
+
+            # A short page means there are no more results
+            if len(items) < per_page:
+                return
+
+            remaining -= len(items)
+            page += 1
+
     def parse_url(
         self, url: str, nbr_items: int = 20, page: int = 1, time: Optional[int] = None
     ) -> Dict:
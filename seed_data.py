@@ -4,266 +4,272 @@ Populates the database with demo data for testing
 """
 
 import database as db
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from functools import lru_cache
 import random
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
+_BUYERS = ('John Smith', 'Sarah Johnson', 'Mike Brown', 'Emma Davis')
+_CARRIERS = ('Royal Mail', 'DPD', 'Hermes')
+
+# Static demo item fields, in _DEMO_ITEM_FIELDS order; rows are bound as-is,
+# so platforms are lists (a Postgres array, where a tuple would be a record)
+_DEMO_ITEM_FIELDS = (
+    'sku', 'item_name', 'category', 'size', 'condition', 'brand', 'platforms', 'listing_status',
+    'purchase_price', 'fees_estimate', 'sale_price', 'location', 'notes'
+)
+# Fields every demo item shares, appended to each row once
+_DEMO_ITEM_BASE = {'shipping_paid_by': 'Buyer', 'shipping_cost': 0}
+_DEMO_ITEM_COLUMNS = _DEMO_ITEM_FIELDS + tuple(_DEMO_ITEM_BASE) + ('date_purchased', 'date_listed', 'date_sold')
+# What the seed reads back from each created item (ids for sales, no re-query)
+_CREATED_ITEM_COLUMNS = (
+    'id', 'sku', 'item_name', 'listing_status', 'platforms', 'sale_price', 'fees_estimate', 'shipping_cost'
+)
+# Per item: (static fields, (days since purchased, listed, sold)); None = not yet
+_DEMO_ITEMS = (
+    (('VINT-NIK-001', 'Nike Air Max 90 White', 'Trainers', 'UK 10', 'Like New', 'Nike', ['Vinted'], 'Sold',
+      45.00, 8.50, 85.00, 'Warehouse', 'Great condition, sold quickly'),
+     (30, 25, 5)),
+    (('VINT-ADI-002', 'Adidas Ultraboost 21 Black', 'Trainers', 'UK 9', 'Good', 'Adidas', ['Vinted', 'Depop'], 'Listed',
+      35.00, 6.50, 65.00, 'Home', 'Listed on multiple platforms'),
+     (20, 15, None)),
+    (('VINT-LEV-003', 'Levis 501 Vintage Jeans', 'Jeans', 'W32 L32', 'New', 'Levis', ['Vinted'], 'Listed',
+      25.00, 4.00, 40.00, 'Warehouse', 'Brand new with tags'),
+     (10, 5, None)),
+    (('VINT-NOR-004', 'The North Face Jacket Green', 'Outerwear', 'L', 'Like New', 'The North Face', ['Vinted'], 'Sold',
+      60.00, 12.00, 120.00, 'Warehouse', 'Premium item, high profit margin'),
+     (40, 35, 10)),
+    (('VINT-PAT-005', 'Patagonia Fleece Navy', 'Fleece', 'M', 'Good', 'Patagonia', ['Depop'], 'Draft',
+      30.00, 5.50, 55.00, 'Home', 'Needs photos before listing'),
+     (3, None, None)),
+    (('VINT-PUM-006', 'Puma Suede Classic Red', 'Trainers', 'UK 8', 'Good', 'Puma', ['Vinted'], 'Listed',
+      20.00, 3.50, 35.00, 'Warehouse', 'Classic style, should sell fast'),
+     (7, 2, None)),
+)
+
+# Per task: (title, description, priority, status, days until due)
+_DEMO_TASK_COLUMNS = ('title', 'description', 'priority', 'status', 'due_date')
+_DEMO_TASKS = (
+    ('List new Nike trainers on eBay', 'Take photos and create listing for VINT-NIK-007', 'High', 'Todo', 2),
+    ('Follow up on pending payout', 'Check Vinted for delayed payout on order ORD-12345', 'Medium', 'In Progress', 1),
+    ('Research trending items', 'Check what trainers are selling well this month', 'Low', 'Todo', 7),
+    ('Update inventory spreadsheet', 'Export and backup inventory data', 'Medium', 'Done', -1),
+)
+
+
+# Fields every demo sale (and its shipment) shares
+_DEMO_SALE_BASE = {
+    'buyer_paid_shipping': True,
+    'payout_status': 'Paid',
+    'notes': 'Smooth transaction',
+    'buyer_address': '123 Main St, London, UK',
+    'shipment_status': 'Delivered',
+}
+
+# NOT NULL columns of items; the numeric ones are nullable but must be numbers if set
+_REQUIRED_ITEM_FIELDS = ('sku', 'item_name')
+_NUMERIC_ITEM_FIELDS = ('purchase_price', 'fees_estimate', 'shipping_cost', 'sale_price')
+
+
+def _validate_items(item_rows):
+    """Split item value tuples into (good, bad) before they reach the bulk insert"""
+    required = [_DEMO_ITEM_COLUMNS.index(field) for field in _REQUIRED_ITEM_FIELDS]
+    numeric = [_DEMO_ITEM_COLUMNS.index(field) for field in _NUMERIC_ITEM_FIELDS]
+
+    # A sold item needs its price, as sales.sale_price is NOT NULL
+    sale_price = _DEMO_ITEM_COLUMNS.index('sale_price')
+
+    good, bad = [], []
+    for row in item_rows:
+        sold = row[-1] is not None
+        if (all(row[i] for i in required)
+                and all(row[i] is None or isinstance(row[i], (int, float)) for i in numeric)
+                and not (sold and row[sale_price] is None)):
+            good.append(row)
+        else:
+            bad.append(row)
+    return good, bad
+
+
+@lru_cache(maxsize=1)
+def _now_cached(ttl_hash):
+    """datetime.now(), shared by every seed run with the same ttl_hash"""
+    return datetime.now()
+
+
+def _created(what, rows):
+    """Without a conn the db helpers log and return None on failure; fail the seed instead"""
+    if rows is None:
+        raise RuntimeError(f"Could not create demo {what}")
+    return rows
+
+
 def seed_demo_data():
     """Populate database with demo inventory, sales, and other data"""
 
     logger.info("Starting database seed...")
 
-    # Demo items data
-    demo_items = [
-        {
-            'sku': 'VINT-NIK-001',
-            'item_name': 'Nike Air Max 90 White',
-            'category': 'Trainers',
-            'size': 'UK 10',
-            'condition': 'Like New',
-            'brand': 'Nike',
-            'platforms': ['Vinted'],
-            'listing_status': 'Sold',
-            'purchase_price': 45.00,
-            'fees_estimate': 8.50,
-            'shipping_paid_by': 'Buyer',
-            'shipping_cost': 0,
-            'sale_price': 85.00,
-            'date_purchased': (datetime.now() - timedelta(days=30)).isoformat(),
-            'date_listed': (datetime.now() - timedelta(days=25)).isoformat(),
-            'date_sold': (datetime.now() - timedelta(days=5)).isoformat(),
-            'location': 'Warehouse',
-            'notes': 'Great condition, sold quickly'
-        },
-        {
-            'sku': 'VINT-ADI-002',
-            'item_name': 'Adidas Ultraboost 21 Black',
-            'category': 'Trainers',
-            'size': 'UK 9',
-            'condition': 'Good',
-            'brand': 'Adidas',
-            'platforms': ['Vinted', 'Depop'],
-            'listing_status': 'Listed',
-            'purchase_price': 35.00,
-            'fees_estimate': 6.50,
-            'shipping_paid_by': 'Buyer',
-            'shipping_cost': 0,
-            'sale_price': 65.00,
-            'date_purchased': (datetime.now() - timedelta(days=20)).isoformat(),
-            'date_listed': (datetime.now() - timedelta(days=15)).isoformat(),
-            'location': 'Home',
-            'notes': 'Listed on multiple platforms'
-        },
-        {
-            'sku': 'VINT-LEV-003',
-            'item_name': 'Levis 501 Vintage Jeans',
-            'category': 'Jeans',
-            'size': 'W32 L32',
-            'condition': 'New',
-            'brand': 'Levis',
-            'platforms': ['Vinted'],
-            'listing_status': 'Listed',
-            'purchase_price': 25.00,
-            'fees_estimate': 4.00,
-            'shipping_paid_by': 'Buyer',
-            'shipping_cost': 0,
-            'sale_price': 40.00,
-            'date_purchased': (datetime.now() - timedelta(days=10)).isoformat(),
-            'date_listed': (datetime.now() - timedelta(days=5)).isoformat(),
-            'location': 'Warehouse',
-            'notes': 'Brand new with tags'
-        },
-        {
-            'sku': 'VINT-NOR-004',
-            'item_name': 'The North Face Jacket Green',
-            'category': 'Outerwear',
-            'size': 'L',
-            'condition': 'Like New',
-            'brand': 'The North Face',
-            'platforms': ['Vinted'],
-            'listing_status': 'Sold',
-            'purchase_price': 60.00,
-            'fees_estimate': 12.00,
-            'shipping_paid_by': 'Buyer',
-            'shipping_cost': 0,
-            'sale_price': 120.00,
-            'date_purchased': (datetime.now() - timedelta(days=40)).isoformat(),
-            'date_listed': (datetime.now() - timedelta(days=35)).isoformat(),
-            'date_sold': (datetime.now() - timedelta(days=10)).isoformat(),
-            'location': 'Warehouse',
-            'notes': 'Premium item, high profit margin'
-        },
-        {
-            'sku': 'VINT-PAT-005',
-            'item_name': 'Patagonia Fleece Navy',
-            'category': 'Fleece',
-            'size': 'M',
-            'condition': 'Good',
-            'brand': 'Patagonia',
-            'platforms': ['Depop'],
-            'listing_status': 'Draft',
-            'purchase_price': 30.00,
-            'fees_estimate': 5.50,
-            'shipping_paid_by': 'Buyer',
-            'shipping_cost': 0,
-            'sale_price': 55.00,
-            'date_purchased': (datetime.now() - timedelta(days=3)).isoformat(),
-            'location': 'Home',
-            'notes': 'Needs photos before listing'
-        },
-        {
-            'sku': 'VINT-PUM-006',
-            'item_name': 'Puma Suede Classic Red',
-            'category': 'Trainers',
-            'size': 'UK 8',
-            'condition': 'Good',
-            'brand': 'Puma',
-            'platforms': ['Vinted'],
-            'listing_status': 'Listed',
-            'purchase_price': 20.00,
-            'fees_estimate': 3.50,
-            'shipping_paid_by': 'Buyer',
-            'shipping_cost': 0,
-            'sale_price': 35.00,
-            'date_purchased': (datetime.now() - timedelta(days=7)).isoformat(),
-            'date_listed': (datetime.now() - timedelta(days=2)).isoformat(),
-            'location': 'Warehouse',
-            'notes': 'Classic style, should sell fast'
-        }
-    ]
-
-    # Create items
+    # Reseeds within the same second (e.g. a test reseeding per case) reuse one
+    # "now", so their dates line up; the monotonic clock ignores wall-clock jumps
+    now = _now_cached(int(time.monotonic()))
     created_items = []
-    for item_data in demo_items:
-        try:
-            item = db.create_item(item_data)
-            if item:
-                created_items.append(item)
-                logger.info(f"Created item: {item['sku']}")
-        except Exception as e:
-            logger.error(f"Error creating item {item_data['sku']}: {e}")
-
-    logger.info(f"Created {len(created_items)} demo items")
-
-    # Create sales for sold items
-    sold_items = [item for item in created_items if item['listing_status'] == 'Sold']
-
-    for item in sold_items:
-        try:
-            sale_data = {
-                'order_id': f"ORD-{random.randint(10000, 99999)}",
-                'platform': item['platforms'][0] if item['platforms'] else 'Vinted',
-                'item_id': item['id'],
-                'item_name': item['item_name'],
-                'sale_price': item['sale_price'],
-                'fees': item['fees_estimate'],
-                'shipping_cost': item['shipping_cost'],
-                'buyer_paid_shipping': True,
-                'date_sold': item['date_sold'],
-                'date_shipped': (datetime.fromisoformat(item['date_sold']) + timedelta(days=1)).isoformat(),
-                'tracking_number': f"TRK{random.randint(100000, 999999)}",
-                'payout_status': 'Paid',
-                'buyer_name': random.choice(['John Smith', 'Sarah Johnson', 'Mike Brown', 'Emma Davis']),
-                'notes': 'Smooth transaction'
-            }
-
-            sale = db.create_sale(sale_data)
-            if sale:
-                logger.info(f"Created sale for item: {item['sku']}")
-
-                # Create shipment record
-                shipment_data = {
-                    'sale_id': sale['id'],
-                    'item_name': item['item_name'],
-                    'platform': sale['platform'],
-                    'buyer_name': sale['buyer_name'],
-                    'buyer_address': '123 Main St, London, UK',
-                    'status': 'Delivered',
-                    'tracking_number': sale['tracking_number'],
-                    'carrier': random.choice(['Royal Mail', 'DPD', 'Hermes']),
-                    'shipped_at': sale['date_shipped'],
-                    'delivered_at': (datetime.fromisoformat(sale['date_shipped']) + timedelta(days=2)).isoformat()
-                }
-
-                shipment = db.create_shipment(shipment_data)
-                if shipment:
-                    logger.info(f"Created shipment for sale: {sale['order_id']}")
-
-        except Exception as e:
-            logger.error(f"Error creating sale/shipment: {e}")
-
-    # Create demo tasks
-    demo_tasks = [
-        {
-            'title': 'List new Nike trainers on eBay',
-            'description': 'Take photos and create listing for VINT-NIK-007',
-            'priority': 'High',
-            'status': 'Todo',
-            'due_date': (datetime.now() + timedelta(days=2)).isoformat()
-        },
-        {
-            'title': 'Follow up on pending payout',
-            'description': 'Check Vinted for delayed payout on order ORD-12345',
-            'priority': 'Medium',
-            'status': 'In Progress',
-            'due_date': (datetime.now() + timedelta(days=1)).isoformat()
-        },
-        {
-            'title': 'Research trending items',
-            'description': 'Check what trainers are selling well this month',
-            'priority': 'Low',
-            'status': 'Todo',
-            'due_date': (datetime.now() + timedelta(days=7)).isoformat()
-        },
-        {
-            'title': 'Update inventory spreadsheet',
-            'description': 'Export and backup inventory data',
-            'priority': 'Medium',
-            'status': 'Done',
-            'due_date': (datetime.now() - timedelta(days=1)).isoformat()
-        }
-    ]
+    atomic = False
+    try:
+        # Demo data is disposable, so the seed commits without waiting on fsync
+        with db.transaction(durable=False) as conn:
+            # With a Postgres pool everything shares this one transaction, so a
+            # failed section rolls the items back too and a re-run starts clean
+            atomic = conn is not None
 
-    for task_data in demo_tasks:
-        try:
-            task = db.create_task(task_data)
-            if task:
-                logger.info(f"Created task: {task['title']}")
-        except Exception as e:
-            logger.error(f"Error creating task: {e}")
-
-    # Create a demo return case
-    if sold_items:
-        try:
-            return_data = {
-                'item_name': 'Nike Air Max (Sample)',
-                'platform': 'Vinted',
-                'reason': 'Item not as described - buyer claimed size was wrong',
-                'status': 'Resolved',
-                'outcome': 'Partial Refund',
-                'refund_amount': 20.00,
-                'opened_at': (datetime.now() - timedelta(days=8)).isoformat(),
-                'resolved_at': (datetime.now() - timedelta(days=2)).isoformat(),
-                'notes': 'Offered 50% refund, buyer accepted'
-            }
-
-            return_case = db.create_return_case(return_data)
-            if return_case:
-                logger.info("Created demo return case")
-        except Exception as e:
-            logger.error(f"Error creating return case: {e}")
+            # Items first; everything else hangs off the created ids
+            created_items, sold_items, sold_at = _seed_items(now, conn)
+
+            sections = [
+                (_seed_tasks, now),
+                (_seed_returns, sold_items, now),
+                (_seed_sales_and_shipments, sold_items, sold_at),
+            ]
+            if atomic:
+                results = [section(*args, conn=conn) for section, *args in sections]
+            else:
+                # Over PostgREST each write commits on its own; the remaining
+                # sections are independent, so run them concurrently
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    futures = [executor.submit(section, *args) for section, *args in sections]
+                    wait(futures)
+                results = [future.result() for future in futures]
+            sales_created = results[-1]
+    except Exception as e:
+        items_kept = 0 if atomic else len(created_items)
+        logger.error(f"Database seed failed ({items_kept} demo items kept): {e}")
+        return {'success': False, 'items_created': items_kept, 'sales_created': 0}
 
     logger.info("Database seed completed!")
     return {
         'success': True,
         'items_created': len(created_items),
-        'sales_created': len(sold_items)
+        'sales_created': sales_created
     }
 
 
+def _seed_items(now, conn):
+    """Create the demo items; returns them, the sold ones, and the sale date per sold sku"""
+
+    def days_ago(days):
+        return now - timedelta(days=days) if days is not None else None
+
+    # Dates are passed as datetimes; the database layer binds them natively.
+    # One value tuple per item in _DEMO_ITEM_COLUMNS order, no per-row dicts
+    base = tuple(_DEMO_ITEM_BASE.values())
+    item_rows = [
+        fields + base + (days_ago(purchased), days_ago(listed), days_ago(sold))
+        for fields, (purchased, listed, sold) in _DEMO_ITEMS
+    ]
+
+    # Check rows up front so one bad row can't fail the whole insert
+    item_rows, bad_rows = _validate_items(item_rows)
+    if bad_rows:
+        logger.warning("Skipped %d invalid items: %s", len(bad_rows), [row[0] for row in bad_rows])
+    sold_at = {row[0]: row[-1] for row in item_rows if row[-1] is not None}
+
+    # Create items (one insert); skus that already exist are skipped, not errors
+    created_items = _created('items', db.create_items_bulk_rows(
+        _DEMO_ITEM_COLUMNS, item_rows, ignore_conflicts_on='sku', conn=conn, returning=_CREATED_ITEM_COLUMNS
+    ))
+    sold_items = []
+    for item in created_items:
+        logger.debug("Created item: %s", item['sku'])
+        if item['listing_status'] == 'Sold':
+            sold_items.append(item)
+
+    logger.info("Created %d demo items: %s", len(created_items), [item['sku'] for item in created_items])
+    return created_items, sold_items, sold_at
+
+
+def _seed_sales_and_shipments(sold_items, sold_at, conn=None):
+    """Create a sale and a delivered shipment for each sold item"""
+
+    items_by_id = {item['id']: item for item in sold_items}
+
+    # Order ids and tracking numbers are drawn by Postgres on insert
+    buyers = random.choices(_BUYERS, k=len(sold_items))
+    carriers = random.choices(_CARRIERS, k=len(sold_items))
+
+    # One row per sale, carrying its shipment's fields too
+    sales_data = []
+    for i, item in enumerate(sold_items):
+        shipped_at = sold_at[item['sku']] + timedelta(days=1)
+        sales_data.append({
+            **_DEMO_SALE_BASE,
+            'platform': item['platforms'][0] if item['platforms'] else 'Vinted',
+            'item_id': item['id'],
+            'item_name': item['item_name'],
+            'sale_price': item['sale_price'],
+            'fees': item['fees_estimate'],
+            'shipping_cost': item['shipping_cost'],
+            'date_sold': sold_at[item['sku']],
+            'date_shipped': shipped_at,
+            'buyer_name': buyers[i],
+            'carrier': carriers[i],
+            'delivered_at': shipped_at + timedelta(days=2)
+        })
+
+    # Sales and shipments go in together (one statement)
+    created = _created('sales', db.create_sales_with_shipments(sales_data, conn=conn))
+    sales = [row['sale'] for row in created]
+    for sale in sales:
+        logger.debug("Created sale for item: %s", items_by_id[sale['item_id']]['sku'])
+
+    logger.info("Created %d demo sales: %s", len(sales), [sale['order_id'] for sale in sales])
+    logger.info("Created %d demo shipments", len(created))
+    return len(sales)
+
+
+def _seed_tasks(now, conn=None):
+    """Create the demo tasks that are not there yet (matched by title)"""
+
+    task_rows = [
+        (title, description, priority, status, now + timedelta(days=due_in))
+        for title, description, priority, status, due_in in _DEMO_TASKS
+    ]
+
+    tasks = _created('tasks', db.create_tasks_bulk_rows(
+        _DEMO_TASK_COLUMNS, task_rows, conn=conn, skip_existing_on='title'
+    ))
+    logger.info("Created %d demo tasks: %s", len(tasks), [task['title'] for task in tasks])
+
+
+def _seed_returns(sold_items, now, conn=None):
+    """Create a demo return case once there is something sold, unless it already exists"""
+
+    if not sold_items:
+        return
+
+    return_data = {
+        'item_name': 'Nike Air Max (Sample)',
+        'platform': 'Vinted',
+        'reason': 'Item not as described - buyer claimed size was wrong',
+        'status': 'Resolved',
+        'outcome': 'Partial Refund',
+        'refund_amount': 20.00,
+        'opened_at': now - timedelta(days=8),
+        'resolved_at': now - timedelta(days=2),
+        'notes': 'Offered 50% refund, buyer accepted'
+    }
+
+    # The bulk form tells "already there" ([]) apart from a failed insert (None)
+    return_cases = _created('return cases', db.create_return_cases_bulk_rows(
+        tuple(return_data), [tuple(return_data.values())], conn=conn, skip_existing_on='item_name'
+    ))
+    if return_cases:
+        logger.info("Created demo return case")
+
+
 if __name__ == "__main__":
     result = seed_demo_data()
     print(f"Seed completed: {result}")
@@ -0,0 +1,47 @@
+/*
+  # Stats RPC functions
+
+  1. New Functions
+    - `items_stats()` - Inventory counts by status and total profit of sold items
+    - `sales_stats()` - Sales count, revenue, profit and average profit
+
+  2. Notes
+    - Aggregation runs in Postgres in a single scan so the dashboard receives
+      one row instead of every item/sale row
+*/
+
+CREATE OR REPLACE FUNCTION items_stats()
+RETURNS TABLE (
+  total_items bigint,
+  listed bigint,
+  sold bigint,
+  draft bigint,
+  total_profit numeric
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    count(*),
+    count(*) FILTER (WHERE listing_status = 'Listed'),
+    count(*) FILTER (WHERE listing_status = 'Sold'),
+    count(*) FILTER (WHERE listing_status = 'Draft'),
+    round(COALESCE(sum(profit) FILTER (WHERE listing_status = 'Sold'), 0), 2)
+  FROM items;
+$$;
+
+CREATE OR REPLACE FUNCTION sales_stats()
+RETURNS TABLE (
+  total_sales bigint,
+  total_revenue numeric,
+  total_profit numeric,
+  avg_profit numeric
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    count(*),
+    round(COALESCE(sum(sale_price), 0), 2),
+    round(COALESCE(sum(net_profit), 0), 2),
+    round(COALESCE(avg(COALESCE(net_profit, 0)), 0), 2)
+  FROM sales;
+$$;
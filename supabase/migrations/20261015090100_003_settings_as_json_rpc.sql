@@ -0,0 +1,13 @@
+/*
+  # Settings JSON RPC
+
+  1. New Functions
+    - `settings_as_json()` - All settings as a single `{key: value}` JSON object
+*/
+
+CREATE OR REPLACE FUNCTION settings_as_json()
+RETURNS jsonb
+LANGUAGE sql STABLE
+AS $$
+  SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) FROM settings;
+$$;
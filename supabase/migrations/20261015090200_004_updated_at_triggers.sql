@@ -0,0 +1,49 @@
+/*
+  # updated_at triggers
+
+  1. New Functions
+    - `set_updated_at()` - Stamps `updated_at` with the database clock
+
+  2. Triggers
+    - BEFORE UPDATE on items, sales, shipments, return_cases, tasks, settings
+*/
+
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.updated_at := now();
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS items_set_updated_at ON items;
+CREATE TRIGGER items_set_updated_at
+  BEFORE UPDATE ON items
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS sales_set_updated_at ON sales;
+CREATE TRIGGER sales_set_updated_at
+  BEFORE UPDATE ON sales
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS shipments_set_updated_at ON shipments;
+CREATE TRIGGER shipments_set_updated_at
+  BEFORE UPDATE ON shipments
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS return_cases_set_updated_at ON return_cases;
+CREATE TRIGGER return_cases_set_updated_at
+  BEFORE UPDATE ON return_cases
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS tasks_set_updated_at ON tasks;
+CREATE TRIGGER tasks_set_updated_at
+  BEFORE UPDATE ON tasks
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS settings_set_updated_at ON settings;
+CREATE TRIGGER settings_set_updated_at
+  BEFORE UPDATE ON settings
+  FOR EACH ROW EXECUTE FUNCTION set_updated_at();
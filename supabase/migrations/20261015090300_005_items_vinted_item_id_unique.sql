@@ -0,0 +1,43 @@
+/*
+  # Unique Vinted item IDs
+
+  1. Changes
+    - Replace the plain index on `items.vinted_item_id` with a unique constraint
+      so Vinted imports can dedup with `ON CONFLICT (vinted_item_id) DO NOTHING`
+
+  2. Notes
+    - Concurrent syncs using the old check-then-insert path could import the same
+      Vinted item twice. The oldest row keeps its `vinted_item_id`; later copies
+      have it cleared (not deleted, since sales cascade from items) and the
+      count is reported as a NOTICE
+    - Safe to re-run
+*/
+
+DO $$
+DECLARE
+  duplicates integer;
+BEGIN
+  WITH ranked AS (
+    SELECT id, row_number() OVER (PARTITION BY vinted_item_id ORDER BY created_at, id) AS rn
+    FROM items
+    WHERE vinted_item_id IS NOT NULL
+  )
+  UPDATE items
+  SET vinted_item_id = NULL
+  FROM ranked
+  WHERE items.id = ranked.id AND ranked.rn > 1;
+
+  GET DIAGNOSTICS duplicates = ROW_COUNT;
+  IF duplicates > 0 THEN
+    RAISE NOTICE 'Cleared vinted_item_id on % duplicate item(s); the oldest copy was kept', duplicates;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conname = 'items_vinted_item_id_key' AND conrelid = 'items'::regclass
+  ) THEN
+    ALTER TABLE items ADD CONSTRAINT items_vinted_item_id_key UNIQUE (vinted_item_id);
+  END IF;
+END $$;
+
+DROP INDEX IF EXISTS idx_items_vinted_item_id;
@@ -0,0 +1,50 @@
+/*
+  # Bulk Vinted import RPC
+
+  1. New Functions
+    - `import_items_bulk(rows jsonb)` - Inserts a JSON array of normalized items
+      in one statement, skipping rows whose `vinted_item_id` already exists,
+      and returns the inserted rows
+*/
+
+CREATE OR REPLACE FUNCTION import_items_bulk(rows jsonb)
+RETURNS SETOF items
+LANGUAGE sql
+AS $$
+  INSERT INTO items (
+    sku, item_name, category, size, condition, brand, platforms, listing_status,
+    purchase_price, fees_estimate, shipping_paid_by, shipping_cost, sale_price,
+    date_purchased, date_listed, date_sold, location, notes, photos,
+    vinted_item_id, vinted_query_id
+  )
+  SELECT
+    sku, item_name, category, size, condition, brand, platforms, listing_status,
+    purchase_price, fees_estimate, shipping_paid_by, shipping_cost, sale_price,
+    date_purchased, date_listed, date_sold, location, notes, photos,
+    vinted_item_id, vinted_query_id
+  FROM jsonb_to_recordset(rows) AS t(
+    sku text,
+    item_name text,
+    category text,
+    size text,
+    condition text,
+    brand text,
+    platforms text[],
+    listing_status text,
+    purchase_price numeric(10, 2),
+    fees_estimate numeric(10, 2),
+    shipping_paid_by text,
+    shipping_cost numeric(10, 2),
+    sale_price numeric(10, 2),
+    date_purchased timestamptz,
+    date_listed timestamptz,
+    date_sold timestamptz,
+    location text,
+    notes text,
+    photos text[],
+    vinted_item_id text,
+    vinted_query_id integer
+  )
+  ON CONFLICT (vinted_item_id) DO NOTHING
+  RETURNING *;
+$$;
@@ -0,0 +1,35 @@
+/*
+  # Vinted SKU generation
+
+  1. New Functions
+    - `set_vinted_sku()` - Fills `items.sku` for imported Vinted items as
+      `VINT-<first 3 brand letters>-<vinted_item_id>`
+
+  2. Triggers
+    - BEFORE INSERT on items, only when no SKU was supplied
+
+  3. Notes
+    - A trigger is used rather than a GENERATED column because manually
+      entered items still provide their own SKUs
+*/
+
+CREATE OR REPLACE FUNCTION set_vinted_sku()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF NEW.sku IS NULL AND NEW.vinted_item_id IS NOT NULL THEN
+    IF COALESCE(NEW.brand, '') = '' THEN
+      NEW.sku := 'VINT-' || NEW.vinted_item_id;
+    ELSE
+      NEW.sku := 'VINT-' || replace(upper(left(NEW.brand, 3)), ' ', '') || '-' || NEW.vinted_item_id;
+    END IF;
+  END IF;
+  RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS items_set_vinted_sku ON items;
+CREATE TRIGGER items_set_vinted_sku
+  BEFORE INSERT ON items
+  FOR EACH ROW EXECUTE FUNCTION set_vinted_sku();
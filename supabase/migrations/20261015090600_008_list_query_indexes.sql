@@ -0,0 +1,28 @@
+/*
+  # Indexes for list queries
+
+  1. Items
+    - `(listing_status, created_at DESC)` and `(category, created_at DESC)` for
+      filtered inventory lists, `(created_at DESC)` for the unfiltered list
+    - Trigram GIN index on `brand` for `ILIKE '%...%'` searches
+
+  2. Sales
+    - `(platform, date_sold DESC)` and `(payout_status, date_sold DESC)`
+
+  3. Notes
+    - The single-column status/platform indexes are prefixes of the new
+      composite indexes and are dropped
+*/
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_items_status_created_at ON items(listing_status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_items_category_created_at ON items(category, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_items_created_at ON items(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_items_brand_trgm ON items USING gin (brand gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_sales_platform_date_sold ON sales(platform, date_sold DESC);
+CREATE INDEX IF NOT EXISTS idx_sales_payout_status_date_sold ON sales(payout_status, date_sold DESC);
+
+DROP INDEX IF EXISTS idx_items_listing_status;
+DROP INDEX IF EXISTS idx_sales_platform;
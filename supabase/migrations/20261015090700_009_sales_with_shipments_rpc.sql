@@ -0,0 +1,76 @@
+/*
+  # Combined sales + shipments insert RPC
+
+  1. New Functions
+    - `create_sales_with_shipments(rows jsonb)` - Inserts a JSON array of sales
+      and one shipment per sale in a single statement. Each row carries the
+      sale fields plus `buyer_address`, `carrier`, `shipment_status` and
+      `delivered_at`. `order_id` (`ORD-` + 5 digits) and `tracking_number`
+      (`TRK` + 6 digits) are filled with random values. Returns one
+      (sale, shipment) pair of jsonb rows per input row
+
+  2. Notes
+    - Sale ids are drawn up front so each shipment joins back to its input row
+      without relying on order_id being unique
+*/
+
+CREATE OR REPLACE FUNCTION create_sales_with_shipments(rows jsonb)
+RETURNS TABLE (sale jsonb, shipment jsonb)
+LANGUAGE sql
+AS $$
+  WITH input AS (
+    SELECT uuid_generate_v4() AS sale_id, t.*
+    FROM jsonb_to_recordset(rows) AS t(
+      platform text,
+      item_id uuid,
+      item_name text,
+      sale_price numeric(10, 2),
+      fees numeric(10, 2),
+      shipping_cost numeric(10, 2),
+      buyer_paid_shipping boolean,
+      date_sold timestamptz,
+      date_shipped timestamptz,
+      payout_status text,
+      buyer_name text,
+      buyer_email text,
+      notes text,
+      buyer_address text,
+      carrier text,
+      shipment_status text,
+      delivered_at timestamptz
+    )
+  ),
+  new_sales AS (
+    INSERT INTO sales (
+      id, order_id, tracking_number, platform, item_id, item_name, sale_price, fees,
+      shipping_cost, buyer_paid_shipping, date_sold, date_shipped, payout_status,
+      buyer_name, buyer_email, notes
+    )
+    SELECT
+      sale_id,
+      'ORD-' || (10000 + floor(random() * 90000))::int,
+      'TRK' || (100000 + floor(random() * 900000))::int,
+      platform, item_id, item_name, sale_price, COALESCE(fees, 0),
+      COALESCE(shipping_cost, 0), COALESCE(buyer_paid_shipping, false),
+      COALESCE(date_sold, now()), date_shipped, COALESCE(payout_status, 'Pending'),
+      buyer_name, buyer_email, notes
+    FROM input
+    RETURNING *
+  ),
+  new_shipments AS (
+    INSERT INTO shipments (
+      sale_id, item_name, platform, buyer_name, buyer_address, status,
+      tracking_number, carrier, shipped_at, delivered_at
+    )
+    SELECT
+      s.id, s.item_name, s.platform, s.buyer_name, i.buyer_address,
+      COALESCE(i.shipment_status, 'Pending'), s.tracking_number, i.carrier,
+      s.date_shipped, i.delivered_at
+    FROM new_sales s
+    JOIN input i ON i.sale_id = s.id
+    RETURNING *
+  )
+  SELECT to_jsonb(s.*), to_jsonb(sh.*)
+  FROM new_sales s
+  JOIN new_shipments sh ON sh.sale_id = s.id;
+$$;